@@ -29,6 +29,11 @@ from sgtk.platform import Engine
 # where an engine may not be present.
 logger = sgtk.LogManager.get_logger(__name__)
 
+# Formatters used to display log messages in Maya script editor.
+# They are built once since formatting happens for every emitted log record.
+_DEBUG_LOG_FORMATTER = logging.Formatter("Debug: PTR %(basename)s: %(message)s")
+_LOG_FORMATTER = logging.Formatter("PTR %(basename)s: %(message)s")
+
 ###############################################################################################
 # methods to support the state when the engine cannot start up
 # for example if a non-sgtk file is loaded in maya
@@ -296,6 +301,9 @@ class MayaEngine(Engine):
 
     __DIALOG_SIZE_CACHE = dict()
 
+    # Qt wrapper of the Maya main window, reused by all dialogs and panels.
+    __maya_main_window = None
+
     @property
     def context_change_allowed(self):
         """
@@ -752,8 +760,13 @@ class MayaEngine(Engine):
         from sgtk.platform.qt import QtGui, shiboken
         import maya.OpenMayaUI as OpenMayaUI
 
-        ptr = OpenMayaUI.MQtUtil.mainWindow()
-        parent = shiboken.wrapInstance(int(ptr), QtGui.QMainWindow)
+        # The Maya main window does not change during a session, so only wrap it again
+        # when there is no wrapper yet or when its underlying object has been deleted.
+        parent = self.__maya_main_window
+        if parent is None or not shiboken.isValid(parent):
+            ptr = OpenMayaUI.MQtUtil.mainWindow()
+            parent = shiboken.wrapInstance(int(ptr), QtGui.QMainWindow)
+            self.__maya_main_window = parent
 
         return parent
 
@@ -787,9 +800,9 @@ class MayaEngine(Engine):
         # where "basename" is the leaf part of the logging record name,
         # for example "tk-multi-shotgunpanel" or "qt_importer".
         if record.levelno < logging.INFO:
-            formatter = logging.Formatter("Debug: PTR %(basename)s: %(message)s")
+            formatter = _DEBUG_LOG_FORMATTER
         else:
-            formatter = logging.Formatter("PTR %(basename)s: %(message)s")
+            formatter = _LOG_FORMATTER
 
         msg = formatter.format(record)
 
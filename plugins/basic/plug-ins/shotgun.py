@@ -105,8 +105,13 @@ def initializePlugin(mobject):
         # added sgtk to the pythonpath.
         import sgtk
 
-    # as early as possible, start up logging to the backend file
-    sgtk.LogManager().initialize_base_file_handler("tk-maya")
+    # Start up logging to the backend file once Maya has settled, rather than
+    # opening the log file while Maya is still loading the plug-in. Deferred
+    # calls are run in order, so the file handler is in place before the
+    # plug-in logic gets bootstrapped below.
+    maya.utils.executeDeferred(
+        sgtk.LogManager().initialize_base_file_handler, "tk-maya"
+    )
 
     # Set the plug-in root directory path constant of the plug-in python package.
     from tk_maya_basic import constants
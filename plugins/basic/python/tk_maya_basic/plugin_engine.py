@@ -9,6 +9,14 @@
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
 import os
+import sys
+
+# The plug-in root directory path is set by the Maya module file and does not
+# change during the Maya session, so build the bundle cache path only once.
+_PLUGIN_ROOT_PATH = os.environ.get("TK_MAYA_BASIC_ROOT")
+_BUNDLE_CACHE_PATH = (
+    os.path.join(_PLUGIN_ROOT_PATH, "bundle_cache") if _PLUGIN_ROOT_PATH else None
+)
 
 
 def bootstrap(sg_user, progress_callback, completed_callback, failed_callback):
@@ -34,14 +42,12 @@ def bootstrap(sg_user, progress_callback, completed_callback, failed_callback):
     toolkit_mgr = sgtk.bootstrap.ToolkitManager(sg_user)
     toolkit_mgr.base_configuration = plugin_info["base_configuration"]
     toolkit_mgr.plugin_id = plugin_info["plugin_id"]
-    plugin_root_path = os.environ.get("TK_MAYA_BASIC_ROOT")
-    toolkit_mgr.bundle_cache_fallback_paths = [
-        os.path.join(plugin_root_path, "bundle_cache")
-    ]
+    if _BUNDLE_CACHE_PATH:
+        toolkit_mgr.bundle_cache_fallback_paths = [_BUNDLE_CACHE_PATH]
 
     # Retrieve the Shotgun entity type and id when they exist in the environment.
     entity = toolkit_mgr.get_entity_from_environment()
-    logger.debug("Will launch the engine with entity: %s" % entity)
+    logger.debug("Will launch the engine with entity: %s", entity)
 
     # Install the bootstrap progress reporting callback.
     toolkit_mgr.progress_callback = progress_callback
@@ -105,8 +111,10 @@ def shutdown():
     Shuts down the running engine.
     """
 
-    # Re-import the toolkit core to ensure usage of a swapped in version.
-    import sgtk
+    # Use the toolkit core registered by the running engine to ensure usage of a
+    # swapped in version. A core swap replaces the registered module, so this
+    # lookup is enough and avoids going through the import machinery again.
+    sgtk = sys.modules["sgtk"]
 
     logger = sgtk.LogManager.get_logger(__name__)
     engine = sgtk.platform.current_engine()
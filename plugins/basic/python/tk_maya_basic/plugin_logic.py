@@ -9,6 +9,7 @@
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
 import logging
+import sys
 
 import maya.utils
 import maya.OpenMaya as OpenMaya
@@ -35,17 +36,36 @@ from . import plugin_engine
 MENU_LOGIN = "ShotGridMenuLogin"
 MENU_LABEL = "Flow Production Tracking"
 
+# Web pages opened from the login menu, parsed only once.
+WEBSITE_URL = QtCore.QUrl("https://www.shotgridsoftware.com")
+SIGNUP_URL = QtCore.QUrl("https://www.shotgridsoftware.com/trial")
+
 logger = sgtk.LogManager.get_logger(__name__)
 
+# Names of the Maya main progress bar and main window,
+# which do not change during a Maya session.
+_main_progress_bar_name = None
+_main_window_name = None
+
+# Authenticator shared by the login and logout logic.
+_authenticator = None
+
+# Whether the login menu is currently displayed.
+_login_menu_present = False
+
+# Last progress percentage and message shown in the main progress bar.
+_last_progress = None
+
 
 class ProgressHandler(QtCore.QObject):
     """
-    An object that wraps a QTimer that is used to periodically check
-    for updates that need to be made to the progress bar in Maya. This
-    will always execute progress updates on the main thread.
+    An object that relays the progress reported from any thread to the
+    progress bar in Maya through a queued signal. This will always
+    execute progress updates on the main thread.
     """
 
-    PROGRESS_INTERVAL = 150  # milliseconds
+    # Signal emitted with the progress value and message to show.
+    progress_changed = QtCore.Signal(float, str)
 
     def __init__(self):
         ptr = OpenMayaUI.MQtUtil.mainWindow()
@@ -53,28 +73,38 @@ class ProgressHandler(QtCore.QObject):
 
         super(ProgressHandler, self).__init__(parent=parent)
 
-        self._progress_value = None
-        self._message = None
-        self._timer = QtCore.QTimer(parent=self)
+        # Whether progress updates are currently shown in the progress bar.
+        self._active = False
+        # Last progress percentage and message handed over to the main thread.
+        self._last_emitted = None
 
-        self._timer.timeout.connect(self._update_progress)
-        self._timer.start(self.PROGRESS_INTERVAL)
+        # Queue the progress updates so that they are handled in the main thread
+        # only when there is new progress to report.
+        self.progress_changed.connect(self._update_progress, QtCore.Qt.QueuedConnection)
 
-    @property
-    def timer(self):
+    def start(self):
         """
-        The QTimer instance that's updating progress.
+        Starts showing the reported progress in the progress bar.
         """
-        return self._timer
+        self._last_emitted = None
+        self._active = True
 
-    def _update_progress(self):
+    def stop(self):
+        """
+        Stops showing the reported progress in the progress bar.
+        Progress updates that are still queued will be discarded.
+        """
+        self._active = False
+
+    def _update_progress(self, progress_value, message):
         """
         Sets progress. Must be run from the main thread!
+
+        :param progress_value: Current progress value, ranging from 0.0 to 1.0.
+        :param message: Progress message to report.
         """
-        if self._message is not None and self._progress_value is not None:
-            _show_progress_bar(self._progress_value, self._message)
-            self._message = None
-            self._progress_value = None
+        if self._active:
+            _show_progress_bar(progress_value, message)
 
     def _handle_bootstrap_progress(self, progress_value, message):
         """
@@ -87,23 +117,48 @@ class ProgressHandler(QtCore.QObject):
         :param message: Progress message to report.
         """
 
-        logger.debug("Bootstrapping Flow Production Tracking: %s" % message)
+        # The progress bar displays an integer percentage, so only hand over
+        # the progress that would visibly change it.
+        progress = (int(progress_value * 100.0), message)
+        if progress == self._last_emitted:
+            return
+        # Progress is reported by one thread at a time, and a single attribute
+        # assignment is atomic, so no locking is needed here.
+        self._last_emitted = progress
+
+        logger.debug("Bootstrapping Flow Production Tracking: %s", message)
+
+        # Hand over the progress to the main thread to update the progress bar.
+        self.progress_changed.emit(progress_value, message)
 
-        # Set some state that will trigger our timer to update the progress bar.
-        self._progress_value = progress_value
-        self._message = message
 
+# Progress handler created the first time the user logs in.
+_progress_handler = None
 
-progress_handler = ProgressHandler()
+
+def _get_progress_handler():
+    """
+    Gets and returns the progress handler, creating it on first use
+    to avoid touching the Maya main window when the plug-in is loaded.
+
+    :returns: The :class:`ProgressHandler` instance.
+    """
+    global _progress_handler
+
+    if _progress_handler is None:
+        _progress_handler = ProgressHandler()
+
+    return _progress_handler
 
 
 def bootstrap():
     """
     Bootstraps the plug-in logic handling user login and logout.
     """
-    if sgtk.authentication.ShotgunAuthenticator().get_default_user():
+    user = _get_authenticator().get_default_user()
+    if user:
         # When the user is already authenticated, automatically log him/her in.
-        _login_user()
+        _login_user(user)
     else:
         # When the user is not yet authenticated, display a login menu.
         _create_login_menu()
@@ -122,22 +177,27 @@ def shutdown():
         _delete_login_menu()
 
 
-def _login_user():
+def _login_user(user=None):
     """
     Logs in the user to Shotgun and starts the engine.
+
+    :param user: Optional :class:`sgtk.authentication.ShotgunUser` instance of an
+                 already authenticated user. When not provided, the user's credentials
+                 will be retrieved from the authenticator.
     """
 
-    try:
-        # When the user is not yet authenticated,
-        # pop up the Shotgun login dialog to get the user's credentials,
-        # otherwise, get the cached user's credentials.
-        user = sgtk.authentication.ShotgunAuthenticator().get_user()
-
-    except sgtk.authentication.AuthenticationCancelled:
-        # When the user cancelled the Shotgun login dialog,
-        # keep around the displayed login menu.
-        OpenMaya.MGlobal.displayInfo("PTR login was cancelled by the user.")
-        return
+    if user is None:
+        try:
+            # When the user is not yet authenticated,
+            # pop up the Shotgun login dialog to get the user's credentials,
+            # otherwise, get the cached user's credentials.
+            user = _get_authenticator().get_user()
+
+        except sgtk.authentication.AuthenticationCancelled:
+            # When the user cancelled the Shotgun login dialog,
+            # keep around the displayed login menu.
+            OpenMaya.MGlobal.displayInfo("PTR login was cancelled by the user.")
+            return
 
     # Get rid of the displayed login menu since the engine menu will take over.
     # We need to make sure the Shotgun login dialog closing events have been
@@ -148,6 +208,8 @@ def _login_user():
 
     # Show a progress bar, and set its initial value and message.
     _show_progress_bar(0.0, "Loading...")
+    progress_handler = _get_progress_handler()
+    progress_handler.start()
 
     # Before bootstrapping the engine for the first time around,
     # the toolkit manager may swap the toolkit core to its latest version.
@@ -173,13 +235,10 @@ def _handle_bootstrap_completed(engine):
 
     :param engine: Launched :class:`sgtk.platform.Engine` instance.
     """
-    progress_handler.timer.stop()
-
-    # Needed global to re-import the toolkit core.
-    global sgtk
+    _get_progress_handler().stop()
 
-    # Re-import the toolkit core to ensure usage of a swapped in version.
-    import sgtk
+    # Ensure usage of a swapped in version of the toolkit core.
+    _use_swapped_in_core()
 
     # Hide the progress bar.
     _hide_progress_bar()
@@ -207,14 +266,11 @@ def _handle_bootstrap_failed(phase, exception):
                   ``ToolkitManager.TOOLKIT_BOOTSTRAP_PHASE`` or ``ToolkitManager.ENGINE_STARTUP_PHASE``.
     :param exception: Python exception raised while bootstrapping.
     """
-    progress_handler.timer.stop()
-
-    # Needed global to re-import the toolkit core.
-    global sgtk
+    _get_progress_handler().stop()
 
     if phase is None or phase == sgtk.bootstrap.ToolkitManager.ENGINE_STARTUP_PHASE:
-        # Re-import the toolkit core to ensure usage of a swapped in version.
-        import sgtk
+        # Ensure usage of a swapped in version of the toolkit core.
+        _use_swapped_in_core()
 
     # Hide the progress bar.
     _hide_progress_bar()
@@ -231,12 +287,49 @@ def _handle_bootstrap_failed(phase, exception):
     OpenMaya.MGlobal.displayError("Error loading PTR integration.")
 
     # Clear the user's credentials to log him/her out.
-    sgtk.authentication.ShotgunAuthenticator().clear_default_user()
+    _get_authenticator().clear_default_user()
 
     # Re-display the login menu.
     _create_login_menu()
 
 
+def _use_swapped_in_core():
+    """
+    Rebinds this module to the toolkit core currently loaded, which is a swapped in
+    version when the toolkit manager updated the core while bootstrapping.
+    """
+    # Needed global to rebind the toolkit core.
+    global sgtk
+    global _authenticator
+
+    # A core swap replaces the registered module, so there is no need to go
+    # through the import machinery again unless it has not been imported yet.
+    swapped_in_sgtk = sys.modules.get("sgtk")
+    if swapped_in_sgtk is None:
+        import sgtk
+    elif swapped_in_sgtk is not sgtk:
+        sgtk = swapped_in_sgtk
+    else:
+        return
+
+    # The cached authenticator was created by the previous toolkit core.
+    _authenticator = None
+
+
+def _get_authenticator():
+    """
+    Gets and returns the Shotgun authenticator, creating it on first use.
+
+    :returns: A :class:`sgtk.authentication.ShotgunAuthenticator` instance.
+    """
+    global _authenticator
+
+    if _authenticator is None:
+        _authenticator = sgtk.authentication.ShotgunAuthenticator()
+
+    return _authenticator
+
+
 def _logout_user():
     """
     Shuts down the engine and logs out the user of Shotgun.
@@ -246,7 +339,7 @@ def _logout_user():
     plugin_engine.shutdown()
 
     # Clear the user's credentials to log him/her out.
-    sgtk.authentication.ShotgunAuthenticator().clear_default_user()
+    _get_authenticator().clear_default_user()
 
     # Re-display the login menu.
     _create_login_menu()
@@ -259,6 +352,14 @@ def _show_progress_bar(progress_value, message):
     :param progress_value: Current progress value, ranging from 0.0 to 1.0.
     :param message: Progress message to report.
     """
+    global _last_progress
+
+    # Only update the progress bar when it would display something new.
+    progress = int(progress_value * 100.0)
+    if (progress, message) == _last_progress:
+        return
+
+    _last_progress = (progress, message)
 
     # Show the main progress bar (normally in the Help Line) making sure it uses
     # the bootstrap progress configuration (since it might have been taken over by another process).
@@ -268,7 +369,7 @@ def _show_progress_bar(progress_value, message):
         beginProgress=True,
         isMainProgressBar=True,
         isInterruptable=False,
-        progress=int(progress_value * 100.0),
+        progress=progress,
         status="Flow Production Tracking: %s" % message,
     )
 
@@ -277,32 +378,56 @@ def _hide_progress_bar():
     """
     Hides the progress bar.
     """
+    global _last_progress
 
     # Hide the main progress bar (normally in the Help Line).
     cmds.progressBar(_get_main_progress_bar_name(), edit=True, endProgress=True)
 
+    _last_progress = None
+
 
 def _get_main_progress_bar_name():
     """
     Gets and returns the name of the main progress bar in Maya.
     :return:
     """
-    return mel.eval("$retvalue = $gMainProgressBar;")
+    global _main_progress_bar_name
+
+    # Only evaluate the mel global variable once since its value never changes.
+    if _main_progress_bar_name is None:
+        _main_progress_bar_name = mel.eval("$retvalue = $gMainProgressBar;")
+
+    return _main_progress_bar_name
+
+
+def _get_main_window_name():
+    """
+    Gets and returns the name of the main window in Maya.
+
+    :returns: Name of the Maya main window.
+    """
+    global _main_window_name
+
+    # Only evaluate the mel global variable once since its value never changes.
+    # In order to get the global variable in mel.eval we have to assign it to another temporary value
+    # so that it returns the result.
+    if _main_window_name is None:
+        _main_window_name = mel.eval("$retvalue = $gMainWindow;")
+
+    return _main_window_name
 
 
 def _create_login_menu():
     """
     Creates and displays a Shotgun user login menu.
     """
+    global _login_menu_present
 
     # Creates the menu entry in the application menu bar.
     menu = cmds.menu(
         MENU_LOGIN,
         label=MENU_LABEL,
-        # Get the mel global variable value for main window.
-        # In order to get the global variable in mel.eval we have to assign it to another temporary value
-        # so that it returns the result.
-        parent=mel.eval("$retvalue = $gMainWindow;"),
+        parent=_get_main_window_name(),
     )
 
     # Add the login menu item.
@@ -326,29 +451,41 @@ def _create_login_menu():
         command=Callback(_jump_to_signup),
     )
 
+    _login_menu_present = True
+
 
 def _delete_login_menu():
     """
     Deletes the displayed Shotgun user login menu.
     """
-    if cmds.menu(MENU_LOGIN, exists=True):
+    global _login_menu_present
+
+    # Nothing to do when the login menu was already deleted.
+    if not _login_menu_present:
+        return
+
+    _login_menu_present = False
+
+    # Delete the menu directly rather than querying its existence first.
+    try:
         cmds.deleteUI(MENU_LOGIN)
+    except RuntimeError:
+        # The login menu is not displayed.
+        pass
 
 
 def _jump_to_website():
     """
     Jumps to the Shotgun website in the default web browser.
     """
-    QtGui.QDesktopServices.openUrl(QtCore.QUrl("https://www.shotgridsoftware.com"))
+    QtGui.QDesktopServices.openUrl(WEBSITE_URL)
 
 
 def _jump_to_signup():
     """
     Jumps to the Shotgun signup page in the default web browser.
     """
-    QtGui.QDesktopServices.openUrl(
-        QtCore.QUrl("https://www.shotgridsoftware.com/trial")
-    )
+    QtGui.QDesktopServices.openUrl(SIGNUP_URL)
 
 
 class Callback(object):
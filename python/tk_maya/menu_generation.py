@@ -16,7 +16,8 @@ Menu handling for Maya
 import sgtk
 import sys
 import os
-import unicodedata
+import functools
+import subprocess
 import maya.cmds as cmds
 from sgtk.platform.qt import QtGui, QtCore
 
@@ -35,6 +36,13 @@ class MenuGenerator(object):
         self._engine = engine
         self._menu_path = menu_path
         self._dialogs = []
+        # what the menu was last built for, so that it is only rebuilt when
+        # the commands or the context have changed.
+        self._menu_signature = None
+        # menu items whose enabled state needs to be refreshed on each display.
+        self._enable_callback_items = []
+        # sub-menus created for commands with '/' in their name while building the menu.
+        self._sub_menu_cache = {}
 
     ##########################################################################################
     # public methods
@@ -42,37 +50,67 @@ class MenuGenerator(object):
     def create_menu(self, *args):
         """
         Render the entire Shotgun menu.
-        In order to have commands enable/disable themselves based on the enable_callback,
-        re-create the menu items every time.
+        The menu items are only re-created when the registered commands or the
+        context have changed since the last time the menu was displayed. Otherwise,
+        only the commands with an enable_callback are refreshed so that they can
+        enable/disable themselves.
+
+        Note that every call still queries the path cache once, to know whether
+        the context has file system locations.
         """
+        # keep the registered command dictionaries themselves so that they can be
+        # compared by identity, since they are re-registered whenever the apps are
+        # reloaded. Holding on to them also guarantees their ids can't be reused.
+        # Folders can be created without the context changing, so whether the
+        # context menu needs to offer to jump to the file system is part of the
+        # signature as well.
+        ctx = self._engine.context
+        has_locations = bool(ctx.filesystem_locations)
+        menu_signature = (
+            ctx,
+            has_locations,
+            list(self._engine.commands.items()),
+        )
+        if self._is_menu_up_to_date(menu_signature) and self._refresh_enabled_items():
+            return
+
+        self._menu_signature = None
+        self._enable_callback_items = []
+        self._sub_menu_cache = {}
+
         cmds.menu(self._menu_path, edit=True, deleteAllItems=True)
 
         # now add the context item on top of the main menu
-        self._context_menu = self._add_context_menu()
+        self._context_menu = self._add_context_menu(has_locations)
         cmds.menuItem(divider=True, parent=self._menu_path)
 
         # now enumerate all items and create menu objects for them
-        menu_items = []
-        for (cmd_name, cmd_details) in self._engine.commands.items():
-            menu_items.append(AppCommand(cmd_name, cmd_details))
+        menu_items = [
+            AppCommand(cmd_name, cmd_details)
+            for (cmd_name, cmd_details) in self._engine.commands.items()
+        ]
 
-        # sort list of commands in name order
+        # sort list of commands in name order, which also keeps the commands
+        # grouped by app below in alphabetical order
         menu_items.sort(key=lambda x: x.name)
 
+        # index all app menu items by app instance name and command name
+        # so that favourites can be looked up directly. Commands without
+        # an app can't be favourites, so leave them out.
+        commands_by_instance_and_name = dict(
+            ((cmd.get_app_instance_name(), cmd.name), cmd)
+            for cmd in menu_items
+            if "app" in cmd.properties
+        )
+
         # now add favourites
         for fav in self._engine.get_setting("menu_favourites"):
-            app_instance_name = fav["app_instance"]
-            menu_name = fav["name"]
-            # scan through all menu items
-            for cmd in menu_items:
-                if (
-                    cmd.get_app_instance_name() == app_instance_name
-                    and cmd.name == menu_name
-                ):
-                    # found our match!
-                    cmd.add_command_to_menu(self._menu_path)
-                    # mark as a favourite item
-                    cmd.favourite = True
+            cmd = commands_by_instance_and_name.get((fav["app_instance"], fav["name"]))
+            if cmd:
+                # found our match!
+                self._add_command_to_menu(cmd, self._menu_path)
+                # mark as a favourite item
+                cmd.favourite = True
 
         cmds.menuItem(divider=True, parent=self._menu_path)
 
@@ -84,7 +122,7 @@ class MenuGenerator(object):
 
             if command.get_type() == "context_menu":
                 # context menu!
-                command.add_command_to_menu(self._context_menu)
+                self._add_command_to_menu(command, self._context_menu)
 
             else:
                 # normal menu
@@ -92,19 +130,75 @@ class MenuGenerator(object):
                 if app_name is None:
                     # un-parented app
                     app_name = "Other Items"
-                if not app_name in commands_by_app:
-                    commands_by_app[app_name] = []
-                commands_by_app[app_name].append(command)
+                commands_by_app.setdefault(app_name, []).append(command)
 
         # now add all apps to main menu
         self._add_app_menu(commands_by_app)
 
+        self._menu_signature = menu_signature
+
+    def _is_menu_up_to_date(self, menu_signature):
+        """
+        Check if the menu was last built for the given signature.
+
+        :param menu_signature: Tuple of the context, whether it has file system locations
+                               and the list of registered (command name, command dictionary).
+        :returns: True if the menu doesn't need to be rebuilt, False otherwise.
+        """
+        if self._menu_signature is None:
+            return False
+
+        (ctx, has_locations, commands) = menu_signature
+        (last_ctx, last_has_locations, last_commands) = self._menu_signature
+        if ctx != last_ctx or has_locations != last_has_locations:
+            return False
+
+        if len(commands) != len(last_commands):
+            return False
+
+        for ((cmd_name, cmd_details), (last_cmd_name, last_cmd_details)) in zip(
+            commands, last_commands
+        ):
+            if cmd_name != last_cmd_name or cmd_details is not last_cmd_details:
+                return False
+
+        return True
+
+    def _refresh_enabled_items(self):
+        """
+        Refresh the enabled state of the menu items whose command has an enable_callback.
+
+        :returns: False if a menu item no longer exists and the menu needs to be rebuilt,
+                  True otherwise.
+        """
+        for (menu_item, command) in self._enable_callback_items:
+            # errors raised by the app's own callback are not a sign that the
+            # menu item is gone, so only the maya edit is guarded below
+            enable = command.properties["enable_callback"]()
+            try:
+                cmds.menuItem(menu_item, edit=True, enable=enable)
+            except RuntimeError:
+                # the menu item was deleted from under us
+                return False
+        return True
+
+    def _add_command_to_menu(self, command, menu):
+        """
+        Adds an app command to the given menu, keeping track of the menu item
+        when its enabled state needs to be refreshed.
+        """
+        menu_item = command.add_command_to_menu(menu, self._sub_menu_cache)
+        if "enable_callback" in command.properties:
+            self._enable_callback_items.append((menu_item, command))
+
     ##########################################################################################
     # context menu and UI
 
-    def _add_context_menu(self):
+    def _add_context_menu(self, has_locations):
         """
         Adds a context menu which displays the current context
+
+        :param has_locations: True if the context has file system locations.
         """
 
         ctx = self._engine.context
@@ -125,7 +219,7 @@ class MenuGenerator(object):
         )
 
         # Add the menu item only when there are some file system locations.
-        if ctx.filesystem_locations:
+        if has_locations:
             cmds.menuItem(
                 label="Jump to File System",
                 parent=ctx_menu,
@@ -152,23 +246,37 @@ class MenuGenerator(object):
         :param state: The state of the menu item
         :return: None
         """
-        # launch one window for each location on disk
         paths = self._engine.context.filesystem_locations
-        for disk_location in paths:
-
-            # run the app
-            if sgtk.util.is_linux():
-                cmd = 'xdg-open "%s"' % disk_location
-            elif sgtk.util.is_macos():
-                cmd = 'open "%s"' % disk_location
-            elif sgtk.util.is_windows():
-                cmd = 'cmd.exe /C start "Folder" "%s"' % disk_location
-            else:
-                raise Exception("Platform '%s' is not supported." % sys.platform)
-
-            exit_code = os.system(cmd)
-            if exit_code != 0:
-                self._engine.logger.error("Failed to launch '%s'!", cmd)
+        if not paths:
+            return
+
+        # the platform does not change from one location to the next,
+        # so figure out once which commands open the locations on disk
+        if sgtk.util.is_linux():
+            # xdg-open only accepts a single location
+            cmds_to_run = [["xdg-open", disk_location] for disk_location in paths]
+        elif sgtk.util.is_macos():
+            # open accepts all the locations in a single invocation
+            cmds_to_run = [["open"] + list(paths)]
+        elif sgtk.util.is_windows():
+            # hand the locations straight to the shell rather than going
+            # through cmd.exe, which also misparses paths containing & or ^
+            for disk_location in paths:
+                try:
+                    os.startfile(disk_location)
+                except OSError:
+                    self._engine.logger.exception("Failed to open '%s'!", disk_location)
+            return
+        else:
+            raise Exception("Platform '%s' is not supported." % sys.platform)
+
+        # launch one window for each location on disk, without waiting
+        # for the file browser before handing control back to Maya
+        for cmd in cmds_to_run:
+            try:
+                subprocess.Popen(cmd)
+            except OSError:
+                self._engine.logger.exception("Failed to launch '%s'!", cmd)
 
     ##########################################################################################
     # app menus
@@ -177,22 +285,28 @@ class MenuGenerator(object):
         """
         Add all apps to the main menu, process them one by one.
         """
-        for app_name in sorted(commands_by_app.keys()):
+        # app names are unique, so sorting the items orders them by app name
+        for (app_name, commands) in sorted(commands_by_app.items()):
 
-            if len(commands_by_app[app_name]) > 1:
+            if len(commands) > 1:
                 # more than one menu entry fort his app
                 # make a sub menu and put all items in the sub menu
+                # the sub menu is only populated the first time it is shown,
+                # most of them are never opened between two menu rebuilds
                 app_menu = cmds.menuItem(
-                    label=app_name, parent=self._menu_path, subMenu=True
+                    label=app_name,
+                    parent=self._menu_path,
+                    subMenu=True,
+                    postMenuCommandOnce=True,
+                )
+                # the callback needs the path of the sub menu to populate
+                cmds.menuItem(
+                    app_menu,
+                    edit=True,
+                    postMenuCommand=functools.partial(
+                        self._populate_app_menu, app_menu, commands
+                    ),
                 )
-
-                # get the list of menu commands for this app
-                commands = commands_by_app[app_name]
-                # make sure it is in alphabetical order
-                commands.sort(key=lambda x: x.name)
-
-                for cmd_obj in commands:
-                    cmd_obj.add_command_to_menu(app_menu)
 
             else:
 
@@ -200,10 +314,20 @@ class MenuGenerator(object):
                 # display that on the menu
                 # todo: Should this be labelled with the name of the app
                 # or the name of the menu item? Not sure.
-                cmd_obj = commands_by_app[app_name][0]
+                cmd_obj = commands[0]
                 if not cmd_obj.favourite:
                     # skip favourites since they are already on the menu
-                    cmd_obj.add_command_to_menu(self._menu_path)
+                    self._add_command_to_menu(cmd_obj, self._menu_path)
+
+    def _populate_app_menu(self, app_menu, commands, *args):
+        """
+        Add the commands of an app to its sub menu, when it is about to be shown.
+
+        :param app_menu: The full path of the app sub menu.
+        :param commands: The app commands, in alphabetical order.
+        """
+        for cmd_obj in commands:
+            self._add_command_to_menu(cmd_obj, app_menu)
 
 
 class Callback(object):
@@ -270,15 +394,9 @@ class AppCommand(Callback):
         if "app" not in self.properties:
             return None
 
-        app_instance = self.properties["app"]
-        engine = app_instance.engine
-
-        for (app_instance_name, app_instance_obj) in engine.apps.items():
-            if app_instance_obj == app_instance:
-                # found our app!
-                return app_instance_name
-
-        return None
+        # the app knows the name it was given in the environment, so there
+        # is no need to search the engine's apps for it
+        return self.properties["app"].instance_name
 
     def get_type(self):
         """
@@ -286,10 +404,18 @@ class AppCommand(Callback):
         """
         return self.properties.get("type", "default")
 
-    def add_command_to_menu(self, menu):
+    def add_command_to_menu(self, menu, sub_menu_cache=None):
         """
         Adds an app command to the menu
+
+        :param menu: The menu to add the command to.
+        :param sub_menu_cache: Optional dictionary of sub-menu paths keyed by their
+                               parent menu path and label, shared across the commands
+                               added while building a menu.
+        :returns: The full path of the menu item created for the command.
         """
+        if sub_menu_cache is None:
+            sub_menu_cache = {}
 
         # create menu sub-tree if need to:
         # Support menu items separated by '/'
@@ -297,15 +423,18 @@ class AppCommand(Callback):
         parts = self.name.split("/")
         for item_label in parts[:-1]:
 
-            # see if there is already a sub-menu item
-            sub_menu = self._find_sub_menu_item(parent_menu, item_label)
-            if sub_menu:
-                # already have sub menu
-                parent_menu = sub_menu
-            else:
+            # see if there is already a sub-menu item, only querying maya
+            # for sub-menus that were not created or found before
+            sub_menu_key = (parent_menu, item_label)
+            sub_menu = sub_menu_cache.get(sub_menu_key)
+            if not sub_menu:
+                sub_menu = self._find_sub_menu_item(parent_menu, item_label)
+            if not sub_menu:
                 # create new sub menu
                 params = {"label": item_label, "parent": parent_menu, "subMenu": True}
-                parent_menu = cmds.menuItem(**params)
+                sub_menu = cmds.menuItem(**params)
+            sub_menu_cache[sub_menu_key] = sub_menu
+            parent_menu = sub_menu
 
         # finally create the command menu item:
         params = {
@@ -318,7 +447,7 @@ class AppCommand(Callback):
         if "enable_callback" in self.properties:
             params["enable"] = self.properties["enable_callback"]()
 
-        cmds.menuItem(**params)
+        return cmds.menuItem(**params)
 
     def _find_sub_menu_item(self, menu, label):
         """
@@ -12,11 +12,17 @@
 Panel support utilities for Maya
 """
 
+import weakref
+
 import maya.mel as mel
 import maya.OpenMayaUI as OpenMayaUI
 
 from sgtk.platform.qt import QtCore, QtGui, shiboken
 
+# Widgets previously found by name, to avoid scanning all the application widgets
+# every time a monitored Maya panel is refreshed or closed.
+_found_widgets = weakref.WeakValueDictionary()
+
 
 def install_event_filter_by_name(maya_panel_name, shotgun_panel_name):
     """
@@ -59,8 +65,18 @@ def _find_widget(widget_name):
     :param widget_name: QT object name to look for
     :returns: QWidget object or None if nothing was found
     """
+    # Reuse the widget found last time, as long as it still exists under that name.
+    widget = _found_widgets.get(widget_name)
+    if (
+        widget is not None
+        and shiboken.isValid(widget)
+        and widget.objectName() == widget_name
+    ):
+        return widget
+
     for widget in QtGui.QApplication.allWidgets():
         if widget.objectName() == widget_name:
+            _found_widgets[widget_name] = widget
             return widget
     return None
 